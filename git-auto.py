@@ -31,9 +31,13 @@ def check_github_auth():
         print("Please make sure you have a valid GitHub token in your .env file")
         sys.exit(1)
 
+def get_projects_dir():
+    """Get the folder holding generated projects (ARTIFACT_ROOT if set)."""
+    return os.getenv('ARTIFACT_ROOT') or "generated_projects"
+
 def get_project_directories():
     """Get list of project directories from generated_projects folder."""
-    base_dir = "generated_projects"
+    base_dir = get_projects_dir()
     if not os.path.exists(base_dir):
         print(f"Error: {base_dir} directory not found")
         sys.exit(1)
@@ -176,11 +180,10 @@ def push_project_to_branch(repo, project_name, token, username):
             print(f"Switched to existing branch: {project_name}")
         
         # Project directory path
-        project_path = os.path.join('generated_projects', project_name)
+        project_path = os.path.join(get_projects_dir(), project_name)
 
         # Reset index to avoid staging leftover files
         repo.git.reset('--mixed')  # unstages everything
-        project_path = os.path.join('generated_projects', project_name)
         for item in os.listdir(project_path):
             s = os.path.join(project_path, item)
             d = os.path.join('.', item)
@@ -0,0 +1,242 @@
+import ast
+import re
+import sys
+from string import Template
+
+# Files rendered locally instead of being written by the LLM
+BOILERPLATE_PATHS = ('requirements.txt', '.env', 'run.py', 'README.md', '.gitignore')
+
+# Dependencies every generated Flask project needs
+BASE_REQUIREMENTS = ['Flask==2.3.3', 'Jinja2==3.1.2', 'python-dotenv==1.0.0']
+
+# Import name -> pinned pip requirement for packages the generated apps commonly use
+KNOWN_REQUIREMENTS = {
+    'requests': 'requests==2.31.0',
+    'flask_cors': 'Flask-Cors==4.0.0',
+    'flask_sqlalchemy': 'Flask-SQLAlchemy==3.1.1',
+    'sqlalchemy': 'SQLAlchemy==2.0.23',
+    'pandas': 'pandas==2.1.4',
+    'numpy': 'numpy==1.26.2',
+    'bs4': 'beautifulsoup4==4.12.2',
+    'dateutil': 'python-dateutil==2.8.2',
+    'pytz': 'pytz==2023.3',
+    'openai': 'openai==1.3.7',
+}
+
+# Top-level import names covered by BASE_REQUIREMENTS
+BASE_IMPORTS = {'flask', 'jinja2', 'dotenv'}
+
+# Import name -> pip package for unknown packages whose names differ
+PACKAGE_NAMES = {
+    'yaml': 'PyYAML',
+    'pil': 'Pillow',
+    'sklearn': 'scikit-learn',
+    'cv2': 'opencv-python',
+    'jwt': 'PyJWT',
+}
+
+# Dotted import prefix -> pip package for namespace packages, where the top-level name is not installable
+NAMESPACE_PACKAGES = {
+    'google.generativeai': 'google-generativeai',
+    'google.cloud.storage': 'google-cloud-storage',
+    'google.cloud.firestore': 'google-cloud-firestore',
+    'google.oauth2': 'google-auth',
+    'google.auth': 'google-auth',
+    'googleapiclient': 'google-api-python-client',
+    'azure.storage.blob': 'azure-storage-blob',
+    'azure.identity': 'azure-identity',
+}
+
+REQUIREMENT_NAME_PATTERN = re.compile(r'^\s*([A-Za-z0-9][A-Za-z0-9._-]*)')
+
+# Top-level names of the namespaces above; on their own they are not installable
+NAMESPACE_ROOTS = {prefix.split('.')[0] for prefix in NAMESPACE_PACKAGES if '.' in prefix}
+
+IMPORT_PATTERN = re.compile(r'^\s*(?:from|import)\s+([A-Za-z_][A-Za-z0-9_.]*)', re.MULTILINE)
+ENV_KEY_PATTERN = re.compile(r'''(?:getenv|environ\.get|environ\[)\(?\s*['"]([A-Z][A-Z0-9_]*)['"]''')
+
+GITIGNORE_TEMPLATE = """\
+# Environment
+.env
+venv/
+.venv/
+
+# Python
+__pycache__/
+*.py[cod]
+
+# Tooling
+git-auto.py
+"""
+
+RUN_TEMPLATE = Template('''\
+import os
+import subprocess
+import sys
+
+PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
+VENV_DIR = os.path.join(PROJECT_DIR, "venv")
+
+
+def venv_python():
+    if os.name == "nt":
+        return os.path.join(VENV_DIR, "Scripts", "python.exe")
+    return os.path.join(VENV_DIR, "bin", "python")
+
+
+def main():
+    if not os.path.exists(venv_python()):
+        print("Creating virtual environment...")
+        subprocess.run([sys.executable, "-m", "venv", VENV_DIR], check=True)
+    print("Installing dependencies...")
+    subprocess.run([venv_python(), "-m", "pip", "install", "-r", os.path.join(PROJECT_DIR, "requirements.txt")], check=True)
+    print("Starting $project_name at http://127.0.0.1:5000")
+    subprocess.run([venv_python(), os.path.join(PROJECT_DIR, "src", "main.py")], cwd=PROJECT_DIR)
+
+
+if __name__ == "__main__":
+    main()
+''')
+
+README_TEMPLATE = Template('''\
+# $summary
+
+Generated for Jira ticket **$ticket_key**.
+
+## Description
+
+$description
+
+## Setup
+
+1. Fill in the API keys in `.env`:
+$env_keys
+2. Run the app (creates a virtual environment and installs dependencies):
+    ```bash
+    python run.py
+    ```
+3. Open http://127.0.0.1:5000 in your browser.
+
+## Dependencies
+
+$requirements
+''')
+
+def requirement_name(requirement):
+    """Normalised package name of a requirement line, or None for comments and options"""
+    match = REQUIREMENT_NAME_PATTERN.match(requirement)
+    if not match:
+        return None
+    return re.sub(r'[-_.]+', '-', match.group(1)).lower()
+
+def local_modules(files):
+    """Top-level module names provided by the generated project itself"""
+    modules = set()
+    for file_info in files:
+        parts = file_info["path"].split('/')
+        if file_info["path"].endswith('.py'):
+            modules.add(parts[-1][:-3])
+        modules.update(parts[:-1])
+    return modules
+
+def imported_modules(source):
+    """
+    Absolute module names imported by a Python source file, as dotted names.
+
+    Uses the AST so string literals are ignored; falls back to a line regex
+    when the generated code does not parse.
+    """
+    try:
+        tree = ast.parse(source)
+    except SyntaxError:
+        return IMPORT_PATTERN.findall(source)
+    modules = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            modules.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.level == 0 and node.module:
+            modules.append(node.module)
+            # `from google import generativeai` names a namespace package member
+            modules.extend(f"{node.module}.{alias.name}" for alias in node.names if alias.name != '*')
+    return modules
+
+def requirement_for(module):
+    """Map a dotted import name to a pip requirement, or None if it is not a distinct package"""
+    for prefix, package in NAMESPACE_PACKAGES.items():
+        if module == prefix or module.startswith(prefix + '.'):
+            return package
+    top_level = module.split('.')[0]
+    if top_level in NAMESPACE_ROOTS:
+        return None
+    lowered = top_level.lower()
+    return KNOWN_REQUIREMENTS.get(lowered) or PACKAGE_NAMES.get(lowered) or top_level
+
+def detect_requirements(files, llm_requirements=""):
+    """
+    Build the requirements list from the imports in the generated Python files.
+
+    Known packages are pinned; any other third-party import is added unpinned,
+    and packages the model listed itself are kept.
+    """
+    requirements = list(BASE_REQUIREMENTS)
+    skipped = set(sys.stdlib_module_names) | local_modules(files) | BASE_IMPORTS
+
+    def add(requirement):
+        names = {requirement_name(r) for r in requirements}
+        if requirement_name(requirement) not in names:
+            requirements.append(requirement)
+
+    for file_info in files:
+        if not file_info["path"].endswith('.py'):
+            continue
+        for module in imported_modules(file_info["content"]):
+            if module.split('.')[0] in skipped:
+                continue
+            requirement = requirement_for(module)
+            if requirement:
+                add(requirement)
+
+    for line in llm_requirements.splitlines():
+        if requirement_name(line):
+            add(line.strip())
+    return requirements
+
+def detect_env_keys(files):
+    """Find the environment variables the generated code reads"""
+    keys = []
+    for file_info in files:
+        for key in ENV_KEY_PATTERN.findall(file_info["content"]):
+            if key not in keys:
+                keys.append(key)
+    return keys
+
+def render_boilerplate(files, ticket_key, ticket_summary, ticket_description, llm_requirements=""):
+    """Render the static project files from ticket metadata and the generated code"""
+    requirements = detect_requirements(files, llm_requirements)
+    env_keys = detect_env_keys(files)
+    project_name = f"project_{ticket_key.lower()}"
+
+    # Placeholders only: never copy this tool's own secrets into a generated project
+    env_lines = ["# API Keys"] + [f"{key}=your_api_key_here" for key in env_keys]
+
+    return [
+        {"path": "requirements.txt", "content": "\n".join(requirements) + "\n"},
+        {"path": ".env", "content": "\n".join(env_lines) + "\n"},
+        {"path": "run.py", "content": RUN_TEMPLATE.substitute(project_name=project_name)},
+        {"path": "README.md", "content": README_TEMPLATE.substitute(
+            summary=ticket_summary,
+            ticket_key=ticket_key,
+            description=ticket_description or "(No description)",
+            env_keys="\n".join(f"    - `{key}`" for key in env_keys) or "    - (none required)",
+            requirements="\n".join(f"- {requirement}" for requirement in requirements)
+        )},
+        {"path": ".gitignore", "content": GITIGNORE_TEMPLATE},
+    ]
+
+def merge_boilerplate(files, ticket_key, ticket_summary, ticket_description):
+    """Combine the LLM-written application files with the rendered boilerplate"""
+    application_files = [f for f in files if f["path"] not in BOILERPLATE_PATHS]
+    llm_requirements = next((f["content"] for f in files if f["path"] == "requirements.txt"), "")
+    return application_files + render_boilerplate(
+        application_files, ticket_key, ticket_summary, ticket_description, llm_requirements
+    )
@@ -0,0 +1,167 @@
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from dotenv import load_dotenv
+
+load_dotenv()
+
+DEFAULT_TIMEOUT_SECONDS = 5
+DEFAULT_CACHE_TTL_SECONDS = 600
+CACHE_PATH = os.path.join(os.path.dirname(__file__), '..', '..', '.doctor_cache.json')
+
+# Services the ticket generation flow cannot run without
+REQUIRED_SERVICES = ("Jira", "Groq")
+
+def check_jira(timeout):
+    """Verify Jira credentials by fetching the authenticated user"""
+    base_url = os.getenv("JIRA_BASE_URL")
+    email = os.getenv("JIRA_EMAIL")
+    token = os.getenv("JIRA_API_TOKEN")
+    if not all([base_url, email, token]):
+        return None
+    response = requests.get(f"{base_url.rstrip('/')}/rest/api/2/myself", auth=(email, token), timeout=timeout)
+    response.raise_for_status()
+    return f"authenticated as {response.json().get('displayName', 'unknown user')}"
+
+def check_groq(timeout):
+    """Verify the Groq API key by listing models"""
+    key = os.getenv("GROQ_API_KEY")
+    if not key:
+        return None
+    response = requests.get("https://api.groq.com/openai/v1/models", headers={"Authorization": f"Bearer {key}"}, timeout=timeout)
+    response.raise_for_status()
+    return "API key accepted"
+
+def check_openai(timeout):
+    """Verify the OpenAI API key by listing models"""
+    key = os.getenv("OPENAI_API_KEY")
+    if not key:
+        return None
+    response = requests.get("https://api.openai.com/v1/models", headers={"Authorization": f"Bearer {key}"}, timeout=timeout)
+    response.raise_for_status()
+    return "API key accepted"
+
+def check_github(timeout):
+    """Verify the GitHub token by fetching the authenticated user"""
+    token = os.getenv("GITHUB_TOKEN")
+    if not token:
+        return None
+    response = requests.get("https://api.github.com/user", headers={"Authorization": f"token {token}"}, timeout=timeout)
+    response.raise_for_status()
+    return f"authenticated as {response.json().get('login', 'unknown user')}"
+
+def check_open_weather(timeout):
+    """Verify the OpenWeather API key with a single lookup"""
+    key = os.getenv("OPEN_WEATHER_API_KEY")
+    if not key:
+        return None
+    response = requests.get(
+        "https://api.openweathermap.org/data/2.5/weather",
+        params={"q": "London", "appid": key},
+        timeout=timeout
+    )
+    response.raise_for_status()
+    return "API key accepted"
+
+# Service name -> (check function, environment variables that make up its credentials)
+CHECKS = {
+    "Jira": (check_jira, ("JIRA_BASE_URL", "JIRA_EMAIL", "JIRA_API_TOKEN")),
+    "Groq": (check_groq, ("GROQ_API_KEY",)),
+    "OpenAI": (check_openai, ("OPENAI_API_KEY",)),
+    "GitHub": (check_github, ("GITHUB_TOKEN",)),
+    "OpenWeather": (check_open_weather, ("OPEN_WEATHER_API_KEY",)),
+}
+
+def credentials_fingerprint(env_names):
+    """Hash the credentials so the cache is invalidated when they change, without storing them"""
+    values = "\0".join(os.getenv(name) or "" for name in env_names)
+    return hashlib.sha256(values.encode('utf-8')).hexdigest()
+
+def load_cache():
+    try:
+        with open(CACHE_PATH, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_cache(cache):
+    try:
+        with open(CACHE_PATH, 'w', encoding='utf-8') as f:
+            json.dump(cache, f, indent=2)
+    except OSError as e:
+        print(f"⚠️ Could not write preflight cache: {e}")
+
+def run_check(name, timeout):
+    """Run one check and time it; errors become a failed result rather than an exception"""
+    check, _ = CHECKS[name]
+    start_time = time.time()
+    try:
+        detail = check(timeout)
+        status = "skipped" if detail is None else "ok"
+        detail = detail or "not configured"
+    except requests.HTTPError as e:
+        status, detail = "failed", f"HTTP {e.response.status_code}"
+    except requests.Timeout:
+        status, detail = "failed", f"timed out after {timeout}s"
+    except Exception as e:
+        status, detail = "failed", type(e).__name__
+    return {"status": status, "detail": detail, "latency": round(time.time() - start_time, 3), "checked_at": time.time()}
+
+def run_preflight(timeout=DEFAULT_TIMEOUT_SECONDS, ttl=DEFAULT_CACHE_TTL_SECONDS, use_cache=True):
+    """Check every integration concurrently, reusing results cached within the TTL"""
+    cache = load_cache() if use_cache else {}
+    results = {}
+    pending = []
+    for name, (_, env_names) in CHECKS.items():
+        cached = cache.get(name)
+        if (cached and cached["fingerprint"] == credentials_fingerprint(env_names)
+                and time.time() - cached["checked_at"] < ttl and cached["status"] != "failed"):
+            results[name] = dict(cached, cached=True)
+        else:
+            pending.append(name)
+
+    if pending:
+        # One thread per service, so the whole run takes about as long as the slowest check
+        with ThreadPoolExecutor(max_workers=len(pending)) as executor:
+            for name, result in zip(pending, executor.map(lambda n: run_check(n, timeout), pending)):
+                result["fingerprint"] = credentials_fingerprint(CHECKS[name][1])
+                results[name] = dict(result, cached=False)
+                cache[name] = result
+        save_cache(cache)
+
+    return {name: results[name] for name in CHECKS}
+
+def print_report(results):
+    """Print per-service status and latency; never prints credentials"""
+    icons = {"ok": "✅", "failed": "❌", "skipped": "⏭️"}
+    print("\n🩺 Preflight checks:")
+    for name, result in results.items():
+        source = " (cached)" if result["cached"] else ""
+        print(f"  {icons[result['status']]} {name:<12} {result['latency'] * 1000:>6.0f} ms  {result['detail']}{source}")
+
+def preflight_ok(results, required=REQUIRED_SERVICES):
+    """True if every required service passed"""
+    return all(results[name]["status"] == "ok" for name in required)
+
+def main():
+    parser = argparse.ArgumentParser(description="Validate every configured integration")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT_SECONDS, help="Per-check timeout in seconds")
+    parser.add_argument("--ttl", type=float, default=DEFAULT_CACHE_TTL_SECONDS, help="Seconds to reuse a passing result")
+    parser.add_argument("--no-cache", action="store_true", help="Ignore cached results")
+    args = parser.parse_args()
+
+    start_time = time.time()
+    results = run_preflight(timeout=args.timeout, ttl=args.ttl, use_cache=not args.no_cache)
+    print_report(results)
+    print(f"\n⏱️ Finished in {time.time() - start_time:.2f}s")
+    failed = any(result["status"] == "failed" for result in results.values())
+    sys.exit(1 if failed or not preflight_ok(results) else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+
+# Default lease length; a worker that misses heartbeats for this long is considered dead
+DEFAULT_LEASE_SECONDS = 120
+DEFAULT_MAX_ATTEMPTS = 3
+
+def get_default_queue_path():
+    """Get the path of the shared job queue database"""
+    # WAL mode relies on shared memory, so the file must be on a local disk used by one host only
+    queue_path = os.getenv("JOB_QUEUE_PATH")
+    if queue_path:
+        return queue_path
+    return os.path.join(os.path.dirname(__file__), '..', '..', 'job_queue.db')
+
+class JobQueue:
+    """
+    Ticket job queue backed by SQLite in WAL mode, shared by worker processes on one host.
+
+    Workers claim jobs by taking a lease that they renew with heartbeats.
+    A job whose lease has expired is handed out again to the next worker
+    that asks, so jobs held by a dead worker are taken over automatically.
+    """
+
+    def __init__(self, path=None, lease_seconds=DEFAULT_LEASE_SECONDS, max_attempts=DEFAULT_MAX_ATTEMPTS):
+        self.path = path or get_default_queue_path()
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    ticket_key TEXT NOT NULL UNIQUE,
+                    summary TEXT NOT NULL,
+                    description TEXT NOT NULL,
+                    status TEXT NOT NULL DEFAULT 'pending',
+                    worker_id TEXT,
+                    lease_expires_at REAL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    last_error TEXT,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status, lease_expires_at)")
+
+    @contextmanager
+    def _connect(self):
+        """Open a short-lived connection; each call is safe to use from any thread or process"""
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        try:
+            conn.execute("PRAGMA busy_timeout=30000")
+            yield conn
+        finally:
+            conn.close()
+
+    @contextmanager
+    def _transaction(self):
+        """Run statements inside a write-locked transaction"""
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+    def enqueue(self, ticket_key, summary, description):
+        """Add a ticket job, or retry it if it previously failed; returns False if it is already queued or done"""
+        now = time.time()
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "INSERT INTO jobs (ticket_key, summary, description, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT(ticket_key) DO UPDATE SET status = 'pending', summary = excluded.summary, "
+                "description = excluded.description, attempts = 0, last_error = NULL, "
+                "updated_at = excluded.updated_at "
+                "WHERE jobs.status = 'failed'",
+                (ticket_key, summary, description or "", now, now)
+            )
+            return cursor.rowcount == 1
+
+    def requeue(self, ticket_keys):
+        """Reset done or failed jobs to pending; returns how many were reset"""
+        placeholders = ", ".join("?" for _ in ticket_keys)
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = 'pending', attempts = 0, last_error = NULL, updated_at = ? "
+                f"WHERE ticket_key IN ({placeholders}) AND status IN ('done', 'failed')",
+                (time.time(), *ticket_keys)
+            )
+            return cursor.rowcount
+
+    def claim(self, worker_id):
+        """Lease the next available job to a worker, or return None if there is nothing to do"""
+        now = time.time()
+        with self._transaction() as conn:
+            # Jobs that used up their attempts while leased are failed rather than retried forever
+            conn.execute(
+                "UPDATE jobs SET status = 'failed', worker_id = NULL, lease_expires_at = NULL, "
+                "last_error = 'lease expired', updated_at = ? "
+                "WHERE status = 'leased' AND lease_expires_at < ? AND attempts >= ?",
+                (now, now, self.max_attempts)
+            )
+            row = conn.execute(
+                "SELECT * FROM jobs "
+                "WHERE status = 'pending' OR (status = 'leased' AND lease_expires_at < ?) "
+                "ORDER BY id LIMIT 1",
+                (now,)
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE jobs SET status = 'leased', worker_id = ?, lease_expires_at = ?, "
+                "attempts = attempts + 1, updated_at = ? WHERE id = ?",
+                (worker_id, now + self.lease_seconds, now, row["id"])
+            )
+            job = dict(row)
+            job["attempts"] += 1
+            job["worker_id"] = worker_id
+            return job
+
+    def heartbeat(self, job_id, worker_id):
+        """Extend a lease; returns False if the worker no longer holds it"""
+        now = time.time()
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET lease_expires_at = ?, updated_at = ? "
+                "WHERE id = ? AND worker_id = ? AND status = 'leased'",
+                (now + self.lease_seconds, now, job_id, worker_id)
+            )
+            return cursor.rowcount == 1
+
+    def complete(self, job_id, worker_id):
+        """Mark a leased job as done"""
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = 'done', lease_expires_at = NULL, updated_at = ? "
+                "WHERE id = ? AND worker_id = ? AND status = 'leased'",
+                (time.time(), job_id, worker_id)
+            )
+            return cursor.rowcount == 1
+
+    def fail(self, job_id, worker_id, error):
+        """Release a failed job for retry, or mark it failed once it is out of attempts"""
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END, "
+                "worker_id = NULL, lease_expires_at = NULL, last_error = ?, updated_at = ? "
+                "WHERE id = ? AND worker_id = ? AND status = 'leased'",
+                (self.max_attempts, str(error), time.time(), job_id, worker_id)
+            )
+            return cursor.rowcount == 1
+
+    def stats(self):
+        """Count jobs by status"""
+        with self._connect() as conn:
+            rows = conn.execute("SELECT status, COUNT(*) AS count FROM jobs GROUP BY status").fetchall()
+            return {row["status"]: row["count"] for row in rows}
@@ -9,6 +9,9 @@ from datetime import datetime
 import requests
 import time
 import webbrowser
+from similarity_index import TicketIndex, get_similarity_threshold, format_report, merge_base_files
+from boilerplate import BOILERPLATE_PATHS, merge_boilerplate
+from doctor import run_preflight, print_report, preflight_ok
 
 # Load environment variables from .env (assumes .env is in project root)
 load_dotenv()
@@ -22,9 +25,10 @@ OPEN_WEATHER_API_KEY = os.getenv("OPEN_WEATHER_API_KEY")
 GROQ_API_KEY = os.getenv("GROQ_API_KEY")
 GROQ_API_URL = "https://api.groq.com/openai/v1/chat/completions"
 GROQ_MODEL = "llama-3.3-70b-versatile"
+GROQ_TIMEOUT_SECONDS = 180
 
 # Check for missing values
-if not all([JIRA_BASE_URL, JIRA_EMAIL, JIRA_API_TOKEN, OPENAI_API_KEY]):
+if not all([JIRA_BASE_URL, JIRA_EMAIL, JIRA_API_TOKEN, OPENAI_API_KEY, GROQ_API_KEY]):
     print("❌ Missing required environment variables. Check your .env file.")
     exit(1)
 
@@ -33,8 +37,11 @@ client = OpenAI(api_key=OPENAI_API_KEY)
 
 def get_project_base_path():
     """Get the base path where projects will be saved"""
-    # Create a 'generated_projects' directory in the workspace root
-    base_path = os.path.join(os.path.dirname(__file__), '..', '..', 'generated_projects')
+    # ARTIFACT_ROOT lets worker processes write generated projects somewhere other than the repo
+    base_path = os.getenv("ARTIFACT_ROOT")
+    if not base_path:
+        # Default to a 'generated_projects' directory in the workspace root
+        base_path = os.path.join(os.path.dirname(__file__), '..', '..', 'generated_projects')
     os.makedirs(base_path, exist_ok=True)
     return base_path
 
@@ -101,12 +108,9 @@ Available API Keys:
 - Ensure the UI clearly displays fetched data or relevant error messages if API calls fail or keys are missing.
 - Design and implement a modern, responsive, and visually appealing user interface and styling using HTML, CSS, and JavaScript as appropriate for the Flask template.
 - Include a dot-env for loading/validating API keys.
-- Directly access the API keys from the `.env` file.
-- Include a gitignore of the files like .env,git-auto.py and folder like venv
-- Include a `.env` template with all required keys mentioned in the ticket description.
-- Include a `run.py` that sets up the virtual environment, installs dependencies, and runs the app.
-- List all dependencies in `requirements.txt`.
-- Include a `README.md` with setup and usage instructions.
+- Directly access the API keys from the `.env` file with `os.getenv("KEY_NAME")`.
+- Do NOT write `requirements.txt`, `.env`, `run.py`, `README.md` or `.gitignore`; they are generated automatically from your code.
+- The app is started by running `src/main.py` from the project root.
 
 ## Output Format
 
@@ -117,11 +121,7 @@ Return a JSON object with this structure:
     {{"path": "src/main.py", "content": "<Flask app code that fetches and displays data>"}},
     {{"path": "src/templates/index.html", "content": "<HTML template with dynamic data and error display>"}},
     {{"path": "src/static/style.css", "content": "<CSS for modern, responsive UI>"}},
-    {{"path": "src/static/app.js", "content": "<JavaScript code for geolocation and dynamic updates>"}},
-    {{"path": ".env", "content": "# API Keys\\nOPEN_WEATHER_API_KEY=your_api_key_here"}},
-    {{"path": "requirements.txt", "content": "Flask==2.3.3\\npython-dotenv==1.0.0\\nrequests==2.31.0\\nJinja2==3.1.2"}},
-    {{"path": "run.py", "content": "<script to set up venv, install requirements, and run the app>"}},
-    {{"path": "README.md", "content": "<setup and usage instructions>"}}
+    {{"path": "src/static/app.js", "content": "<JavaScript code for geolocation and dynamic updates>"}}
   ]
 }}
 
@@ -131,8 +131,56 @@ Return a JSON object with this structure:
 - For location-based features, the JavaScript code must use navigator.geolocation to get the user's current location.
 - The UI must be visually appealing and responsive as per the styling requirement.
 - The CSS should be internal in the HTML and well made for better Styling
-- All files must be included in the output JSON.
-- The app must run with `python run.py` and work out-of-the-box.
+- All application files must be included in the output JSON.
+- The app must work out-of-the-box.
+
+Respond ONLY with the JSON object, no extra text.
+"""
+        # Build on the nearest past project when this ticket closely matches one
+        project_name = f"project_{ticket_key.lower()}"
+        index = TicketIndex(get_project_base_path())
+        match, score = index.nearest(ticket_summary, ticket_description, exclude_project=project_name)
+        base_files = None
+        if match and score >= get_similarity_threshold():
+            project_files, omitted = index.load_project_files(match["project_name"])
+            if omitted:
+                # The model could not see these files, so a merged project would be incomplete
+                print(f"\n⚠️ {match['project_name']} has files too large to reuse ({', '.join(omitted)}); generating from scratch")
+            else:
+                # Boilerplate is rendered locally, so only the application files are sent
+                base_files = [f for f in project_files if f["path"] not in BOILERPLATE_PATHS]
+        if base_files:
+            print(f"\n♻️ Reusing {match['project_name']} ({match['ticket_key']}, similarity {score:.2f}) as a base")
+            prompt = f"""
+You are a senior software engineer. Below is an existing, working Python Flask application that was generated for a similar Jira ticket. Adapt it so that it meets the requirements of the NEW ticket.
+
+NEW Ticket Key: {ticket_key}
+NEW Summary: {ticket_summary}
+NEW Description: {ticket_description}
+
+Original ticket it was built for: {match['summary']}
+
+Available API Keys:
+{json.dumps(available_api_keys, indent=2)}
+
+## Existing Project Files
+
+{json.dumps(base_files, indent=2)}
+
+## Output Format
+
+Return a JSON object with ONLY the files that must be added or changed, each with its full new content:
+{{
+  "project_name": "{project_name}",
+  "files": [
+    {{"path": "<relative path>", "content": "<full file content>"}}
+  ]
+}}
+
+- Do NOT include files that can be kept unchanged.
+- Do NOT write `requirements.txt`, `.env`, `run.py`, `README.md` or `.gitignore`; they are generated automatically from your code.
+- Keep the same structure, conventions and dependencies unless the new ticket requires otherwise.
+- The app must still work out-of-the-box.
 
 Respond ONLY with the JSON object, no extra text.
 """
@@ -148,9 +196,14 @@ Respond ONLY with the JSON object, no extra text.
             ],
             "temperature": 0.7
         }
-        response = requests.post(GROQ_API_URL, headers=headers, json=data)
+        start_time = time.time()
+        response = requests.post(GROQ_API_URL, headers=headers, json=data, timeout=GROQ_TIMEOUT_SECONDS)
         response.raise_for_status()
-        response_content = response.json()["choices"][0]["message"]["content"].strip()
+        response_json = response.json()
+        completion_tokens = response_json.get("usage", {}).get("completion_tokens")
+        stats = index.record_generation(bool(base_files), time.time() - start_time, completion_tokens)
+        print(f"\n{format_report(stats)}")
+        response_content = response_json["choices"][0]["message"]["content"].strip()
         print("\n📄 RAW LLM RESPONSE:\n")
         print(response_content)
         import re
@@ -158,6 +211,12 @@ Respond ONLY with the JSON object, no extra text.
         response_content_clean = re.sub(r'^```(?:json)?|```$', '', response_content.strip(), flags=re.MULTILINE).strip()
         try:
             project_data = json.loads(response_content_clean)
+            if base_files:
+                project_data["project_name"] = project_name
+                project_data["files"] = merge_base_files(base_files, project_data.get("files", []))
+            project_data["files"] = merge_boilerplate(
+                project_data.get("files", []), ticket_key, ticket_summary, ticket_description
+            )
             return project_data
         except json.JSONDecodeError as e:
             print(f"\n❌ JSON Parse Error: {str(e)}")
@@ -345,110 +404,134 @@ def get_python_path(project_name):
                     return path
     return python_path if os.path.exists(python_path) else None
 
-# Connect to Jira
-try:
-    jira = JIRA(
-        server=JIRA_BASE_URL,
-        basic_auth=(JIRA_EMAIL, JIRA_API_TOKEN)
-    )
-    print("✅ Connected to Jira!")
-except Exception as e:
-    print(f"❌ Failed to connect to Jira: {e}")
-    exit(1)
+def transition_to_in_progress(jira, ticket_key):
+    """Transition a ticket to In Progress"""
+    try:
+        transitions = jira.transitions(ticket_key)
+        in_progress_transition = next((t for t in transitions if t['name'].lower() == 'in progress'), None)
+        if in_progress_transition:
+            jira.transition_issue(ticket_key, in_progress_transition['id'])
+            print(f"✅ Ticket {ticket_key} transitioned to In Progress.")
+        else:
+            print(f"❌ Could not find 'In Progress' transition for ticket {ticket_key}.")
+    except Exception as e:
+        print(f"❌ Error transitioning ticket: {e}")
 
-# Fetch assigned tickets that are NOT in Done
-jql_query = 'assignee = currentUser() AND statusCategory != Done ORDER BY updated DESC'
-try:
-    issues = jira.search_issues(jql_query, maxResults=10)
+def connect_jira():
+    """Connect to Jira, exiting if the connection fails"""
+    try:
+        jira = JIRA(
+            server=JIRA_BASE_URL,
+            basic_auth=(JIRA_EMAIL, JIRA_API_TOKEN)
+        )
+        print("✅ Connected to Jira!")
+        return jira
+    except Exception as e:
+        print(f"❌ Failed to connect to Jira: {e}")
+        exit(1)
 
-    if not issues:
-        print("📭 No active tickets assigned to you.")
-        exit(0)
+def main():
+    # Validate credentials up front instead of failing partway through a run
+    results = run_preflight()
+    print_report(results)
+    if not preflight_ok(results):
+        print("❌ Preflight checks failed. Run integrations/doctor.py for details.")
+        exit(1)
 
-    # Show selection menu
-    print("\n📋 Select a Jira Ticket:\n")
-    for idx, issue in enumerate(issues):
-        print(f"{idx + 1}. {issue.key} - {issue.fields.summary} [Status: {issue.fields.status.name}]")
+    jira = connect_jira()
 
-    # User picks ticket
-    choice = int(input("\n🔎 Enter the number of the ticket you want to process: ")) - 1
+    # Fetch assigned tickets that are NOT in Done
+    jql_query = 'assignee = currentUser() AND statusCategory != Done ORDER BY updated DESC'
+    try:
+        issues = jira.search_issues(jql_query, maxResults=10)
 
-    if choice < 0 or choice >= len(issues):
-        print("❌ Invalid selection.")
-        exit(1)
+        if not issues:
+            print("📭 No active tickets assigned to you.")
+            exit(0)
 
-    selected_issue = issues[choice]
-    print(f"\n✅ You selected: {selected_issue.key} - {selected_issue.fields.summary}")
-    print("\n📝 Ticket Description:\n")
-    print(selected_issue.fields.description or "(No description)")
+        # Show selection menu
+        print("\n📋 Select a Jira Ticket:\n")
+        for idx, issue in enumerate(issues):
+            print(f"{idx + 1}. {issue.key} - {issue.fields.summary} [Status: {issue.fields.status.name}]")
 
-    # Check if project already exists
-    project_exists, project_name = check_existing_project(selected_issue.key)
-    
-    if project_exists:
-        print(f"\n📂 Found existing project: {project_name}")
-        action = input("\nWhat would you like to do?\n1. Run existing project\n2. Regenerate project\nEnter choice (1/2): ").strip()
-        
-        if action == "1":
-            python_path = get_python_path(project_name)
-            if python_path:
-                if run_project(project_name, python_path):
-                    print("\n✅ Project is running! You can access it in your browser.")
+        # User picks ticket
+        choice = int(input("\n🔎 Enter the number of the ticket you want to process: ")) - 1
+
+        if choice < 0 or choice >= len(issues):
+            print("❌ Invalid selection.")
+            exit(1)
+
+        selected_issue = issues[choice]
+        print(f"\n✅ You selected: {selected_issue.key} - {selected_issue.fields.summary}")
+        print("\n📝 Ticket Description:\n")
+        print(selected_issue.fields.description or "(No description)")
+
+        # Check if project already exists
+        project_exists, project_name = check_existing_project(selected_issue.key)
+
+        if project_exists:
+            print(f"\n📂 Found existing project: {project_name}")
+            action = input("\nWhat would you like to do?\n1. Run existing project\n2. Regenerate project\nEnter choice (1/2): ").strip()
+
+            if action == "1":
+                python_path = get_python_path(project_name)
+                if python_path:
+                    if run_project(project_name, python_path):
+                        print("\n✅ Project is running! You can access it in your browser.")
+                    else:
+                        print("\n❌ Failed to run project. Please check the error messages above.")
                 else:
-                    print("\n❌ Failed to run project. Please check the error messages above.")
+                    print("❌ Could not find Python in virtual environment. Please regenerate the project.")
+            elif action == "2":
+                print("\n🔄 Regenerating project...")
+                # Continue with existing generation flow
             else:
-                print("❌ Could not find Python in virtual environment. Please regenerate the project.")
-        elif action == "2":
-            print("\n🔄 Regenerating project...")
-            # Continue with existing generation flow
+                print("❌ Invalid choice.")
+                exit(1)
         else:
-            print("❌ Invalid choice.")
-            exit(1)
-    else:
-        # Transition ticket to In Progress
-        try:
-            transitions = jira.transitions(selected_issue)
-            in_progress_transition = next((t for t in transitions if t['name'].lower() == 'in progress'), None)
-            if in_progress_transition:
-                jira.transition_issue(selected_issue, in_progress_transition['id'])
-                print(f"✅ Ticket {selected_issue.key} transitioned to In Progress.")
-            else:
-                print(f"❌ Could not find 'In Progress' transition for ticket {selected_issue.key}.")
-        except Exception as e:
-            print(f"❌ Error transitioning ticket: {e}")
-
-        # Generate application code
-        print("\n🤖 Generating application code...")
-        project_data = generate_application_code(
-            selected_issue.fields.description or "",
-            selected_issue.fields.summary,
-            selected_issue.key
-        )
-        
-        if project_data:
-            print("\n📁 Creating project structure and files...")
-            if create_application_files(project_data):
-                print("\n🔧 Setting up virtual environment and installing dependencies...")
-                success, python_path = setup_virtual_environment(project_data["project_name"])
-                if success:
-                    project_path = os.path.join(get_project_base_path(), project_data["project_name"])
-                    print(f"\n✨ Successfully created application!")
-                    print(f"📂 Project location: {project_path}")
-                    print("\n📚 Please check the README.md file for setup and running instructions.")
-                    
-                    # Ask user if they want to run the project
-                    run_now = input("\n🚀 Would you like to run the project now? (y/n): ").lower().strip()
-                    if run_now == 'y':
-                        if run_project(project_data["project_name"], python_path):
-                            print("\n✅ Project is running! You can access it in your browser.")
-                        else:
-                            print("\n❌ Failed to run project. Please check the error messages above.")
+            transition_to_in_progress(jira, selected_issue.key)
+
+            # Generate application code
+            print("\n🤖 Generating application code...")
+            project_data = generate_application_code(
+                selected_issue.fields.description or "",
+                selected_issue.fields.summary,
+                selected_issue.key
+            )
+
+            if project_data:
+                print("\n📁 Creating project structure and files...")
+                if create_application_files(project_data):
+                    TicketIndex(get_project_base_path()).add(
+                        selected_issue.key,
+                        selected_issue.fields.summary,
+                        selected_issue.fields.description or "",
+                        project_data["project_name"]
+                    )
+                    print("\n🔧 Setting up virtual environment and installing dependencies...")
+                    success, python_path = setup_virtual_environment(project_data["project_name"])
+                    if success:
+                        project_path = os.path.join(get_project_base_path(), project_data["project_name"])
+                        print(f"\n✨ Successfully created application!")
+                        print(f"📂 Project location: {project_path}")
+                        print("\n📚 Please check the README.md file for setup and running instructions.")
+
+                        # Ask user if they want to run the project
+                        run_now = input("\n🚀 Would you like to run the project now? (y/n): ").lower().strip()
+                        if run_now == 'y':
+                            if run_project(project_data["project_name"], python_path):
+                                print("\n✅ Project is running! You can access it in your browser.")
+                            else:
+                                print("\n❌ Failed to run project. Please check the error messages above.")
+                    else:
+                        print("❌ Failed to set up virtual environment")
                 else:
-                    print("❌ Failed to set up virtual environment")
+                    print("❌ Failed to create application files")
             else:
-                print("❌ Failed to create application files")
-        else:
-            print("❌ Failed to generate application code")
+                print("❌ Failed to generate application code")
+
+    except Exception as e:
+        print(f"❌ Error fetching tickets: {e}")
 
-except Exception as e:
-    print(f"❌ Error fetching tickets: {e}")
+if __name__ == "__main__":
+    main()
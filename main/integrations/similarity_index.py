@@ -0,0 +1,185 @@
+import math
+import os
+import re
+import sqlite3
+from collections import Counter
+from contextlib import contextmanager
+
+INDEX_FILENAME = ".ticket_index.db"
+# Calibrated so rewordings of a ticket (about 0.3-0.5) match and unrelated tickets (below 0.16) do not
+DEFAULT_SIMILARITY_THRESHOLD = 0.25
+
+# Files from a base project that are worth showing to the model
+BASE_FILE_EXTENSIONS = ('.py', '.html', '.css', '.js', '.txt', '.md')
+BASE_FILE_NAMES = ('.env', '.gitignore')
+SKIPPED_DIRECTORIES = ('venv', '.venv', '__pycache__', '.git', 'node_modules')
+MAX_BASE_FILE_CHARS = 20000
+
+STOP_WORDS = {
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'in', 'is', 'it',
+    'of', 'on', 'or', 'should', 'that', 'the', 'this', 'to', 'with', 'will', 'user', 'app'
+}
+
+def tokenize(text):
+    """Split text into lowercase word tokens without stop words"""
+    return [t for t in re.findall(r"[a-z0-9]+", (text or "").lower()) if t not in STOP_WORDS and len(t) > 1]
+
+def get_similarity_threshold():
+    """Read the minimum cosine similarity for reusing a project"""
+    try:
+        return float(os.getenv("SIMILARITY_THRESHOLD", DEFAULT_SIMILARITY_THRESHOLD))
+    except ValueError:
+        return DEFAULT_SIMILARITY_THRESHOLD
+
+class TicketIndex:
+    """
+    Local TF-IDF index over past tickets, linked to their generated projects.
+
+    The index is a SQLite file kept next to the generated projects so that it
+    travels with them and parallel workers can update it safely. Running
+    totals of lookups, generation time and output tokens are stored alongside
+    the entries to report the hit rate and time saved.
+    """
+
+    def __init__(self, base_path):
+        self.base_path = base_path
+        self.path = os.path.join(base_path, INDEX_FILENAME)
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS tickets (
+                    ticket_key TEXT PRIMARY KEY,
+                    summary TEXT NOT NULL,
+                    description TEXT NOT NULL,
+                    project_name TEXT NOT NULL
+                )
+            """)
+            conn.execute("CREATE TABLE IF NOT EXISTS stats (name TEXT PRIMARY KEY, value REAL NOT NULL)")
+
+    @contextmanager
+    def _connect(self):
+        """Open a short-lived connection; each call is safe to use from any thread or process"""
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def add(self, ticket_key, summary, description, project_name):
+        """Record a generated project so later tickets can build on it"""
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO tickets (ticket_key, summary, description, project_name) VALUES (?, ?, ?, ?)",
+                (ticket_key, summary, description or "", project_name)
+            )
+
+    def nearest(self, summary, description, exclude_project=None):
+        """Return (entry, score) for the most similar past ticket whose project still exists"""
+        with self._connect() as conn:
+            rows = conn.execute("SELECT * FROM tickets").fetchall()
+        entries = [
+            dict(row) for row in rows
+            if row["project_name"] != exclude_project
+            and os.path.isdir(os.path.join(self.base_path, row["project_name"]))
+        ]
+        if not entries:
+            return None, 0.0
+
+        documents = [Counter(tokenize(f"{e['summary']} {e['description']}")) for e in entries]
+        query = Counter(tokenize(f"{summary} {description}"))
+
+        # Smoothed inverse document frequency over the past tickets only, so that
+        # terms shared with the query are not penalised in a small index
+        doc_freq = Counter()
+        for doc in documents:
+            doc_freq.update(doc.keys())
+
+        def idf(term):
+            return math.log((1 + len(documents)) / (1 + doc_freq[term])) + 1
+
+        def weigh(counts):
+            vector = {term: count * idf(term) for term, count in counts.items()}
+            norm = math.sqrt(sum(w * w for w in vector.values()))
+            return vector, norm
+
+        query_vector, query_norm = weigh(query)
+        if not query_norm:
+            return None, 0.0
+
+        best_entry, best_score = None, 0.0
+        for entry, doc in zip(entries, documents):
+            vector, norm = weigh(doc)
+            if not norm:
+                continue
+            score = sum(w * vector.get(term, 0.0) for term, w in query_vector.items()) / (query_norm * norm)
+            if score > best_score:
+                best_entry, best_score = entry, score
+        return best_entry, best_score
+
+    def load_project_files(self, project_name):
+        """
+        Read the source files of an existing project as a list of {path, content}.
+
+        Returns the files together with the paths of any files too large to send.
+        """
+        project_path = os.path.join(self.base_path, project_name)
+        files = []
+        omitted = []
+        for root, dirs, filenames in os.walk(project_path):
+            dirs[:] = [d for d in dirs if d not in SKIPPED_DIRECTORIES]
+            for filename in sorted(filenames):
+                if not filename.endswith(BASE_FILE_EXTENSIONS) and filename not in BASE_FILE_NAMES:
+                    continue
+                file_path = os.path.join(root, filename)
+                try:
+                    with open(file_path, 'r', encoding='utf-8') as f:
+                        content = f.read()
+                except (OSError, UnicodeDecodeError):
+                    continue
+                relative_path = os.path.relpath(file_path, project_path).replace(os.sep, '/')
+                if len(content) > MAX_BASE_FILE_CHARS:
+                    omitted.append(relative_path)
+                    continue
+                files.append({"path": relative_path, "content": content})
+        return files, omitted
+
+    def record_generation(self, hit, seconds, completion_tokens=None):
+        """Add one lookup to the running totals of LLM time and output tokens"""
+        mode = "base" if hit else "full"
+        increments = {"lookups": 1, "hits": 1 if hit else 0, f"{mode}_count": 1, f"{mode}_seconds": seconds}
+        if completion_tokens is not None:
+            increments[f"{mode}_token_count"] = 1
+            increments[f"{mode}_tokens"] = completion_tokens
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.executemany(
+                "INSERT INTO stats (name, value) VALUES (?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET value = value + excluded.value",
+                increments.items()
+            )
+            rows = conn.execute("SELECT name, value FROM stats").fetchall()
+            conn.execute("COMMIT")
+        return {row["name"]: row["value"] for row in rows}
+
+def merge_base_files(base_files, changed_files):
+    """Overlay the files the model added or changed on the files of the base project"""
+    merged_files = {f["path"]: f for f in base_files}
+    merged_files.update({f["path"]: f for f in changed_files})
+    return list(merged_files.values())
+
+def format_report(stats):
+    """Summarise hit rate and estimated time saved"""
+    lookups = int(stats.get("lookups", 0))
+    hits = int(stats.get("hits", 0))
+    hit_rate = (hits / lookups * 100) if lookups else 0.0
+    report = f"📈 Similarity index: {hits}/{lookups} hits ({hit_rate:.0f}%)"
+    if stats.get("full_count") and stats.get("base_count"):
+        avg_full = stats["full_seconds"] / stats["full_count"]
+        avg_base = stats["base_seconds"] / stats["base_count"]
+        saved = (avg_full - avg_base) * hits
+        report += f", avg {avg_full:.1f}s from scratch vs {avg_base:.1f}s from a base project, ~{saved:.0f}s saved"
+    if stats.get("full_token_count") and stats.get("base_token_count"):
+        avg_full = stats["full_tokens"] / stats["full_token_count"]
+        avg_base = stats["base_tokens"] / stats["base_token_count"]
+        report += f", avg {avg_full:.0f} vs {avg_base:.0f} output tokens"
+    return report
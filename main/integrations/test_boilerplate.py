@@ -0,0 +1,52 @@
+from boilerplate import detect_requirements, merge_boilerplate
+
+def files_by_path(files):
+    return {f["path"]: f["content"] for f in files}
+
+def test_unknown_third_party_imports_are_kept():
+    files = [{"path": "src/main.py", "content": (
+        "import os\nimport json\nfrom flask import Flask\nimport requests\n"
+        "from geopy.geocoders import Nominatim\nimport matplotlib.pyplot as plt\nfrom utils import helper\n"
+    )}, {"path": "src/utils.py", "content": "def helper():\n    pass\n"}]
+    requirements = detect_requirements(files)
+    assert requirements == [
+        "Flask==2.3.3", "Jinja2==3.1.2", "python-dotenv==1.0.0",
+        "requests==2.31.0", "geopy", "matplotlib",
+    ]
+
+def test_comma_separated_imports_are_detected():
+    files = [{"path": "src/main.py", "content": "import os, requests\nimport json, geopy.distance\n"}]
+    assert detect_requirements(files)[3:] == ["requests==2.31.0", "geopy"]
+
+def test_import_lines_inside_strings_are_ignored():
+    files = [{"path": "src/main.py", "content": (
+        "from flask import Flask, render_template_string\n"
+        "PAGE = \"\"\"\n<p>Weather data\nfrom the OpenWeather API</p>\n<p>Allow us to\nimport your location</p>\n\"\"\"\n"
+    )}]
+    assert detect_requirements(files) == ["Flask==2.3.3", "Jinja2==3.1.2", "python-dotenv==1.0.0"]
+
+def test_namespace_packages_map_to_their_distribution():
+    files = [{"path": "src/main.py", "content": (
+        "import google.generativeai as genai\nfrom google.cloud import storage\n"
+    )}]
+    assert detect_requirements(files)[3:] == ["google-generativeai", "google-cloud-storage"]
+
+def test_unparseable_code_falls_back_to_the_regex():
+    files = [{"path": "src/main.py", "content": "import requests\ndef broken(:\n"}]
+    assert detect_requirements(files)[3:] == ["requests==2.31.0"]
+
+def test_llm_requirements_are_merged():
+    files = [
+        {"path": "src/main.py", "content": "import requests\n"},
+        {"path": "requirements.txt", "content": "# deps\nflask==2.3.3\nrequests\ngeopy==2.4.1\n"},
+    ]
+    rendered = files_by_path(merge_boilerplate(files, "KAN-1", "Weather", "Show weather"))
+    assert rendered["requirements.txt"].splitlines() == [
+        "Flask==2.3.3", "Jinja2==3.1.2", "python-dotenv==1.0.0", "requests==2.31.0", "geopy==2.4.1",
+    ]
+
+def test_env_uses_placeholders(monkeypatch):
+    monkeypatch.setenv("OPEN_WEATHER_API_KEY", "real-secret")
+    files = [{"path": "src/main.py", "content": "import os\nKEY = os.getenv('OPEN_WEATHER_API_KEY')\n"}]
+    rendered = files_by_path(merge_boilerplate(files, "KAN-1", "Weather", "Show weather"))
+    assert rendered[".env"] == "# API Keys\nOPEN_WEATHER_API_KEY=your_api_key_here\n"
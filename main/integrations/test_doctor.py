@@ -0,0 +1,70 @@
+import pytest
+
+pytest.importorskip("requests")
+pytest.importorskip("dotenv")
+
+import doctor
+
+@pytest.fixture
+def checks(tmp_path, monkeypatch):
+    """Replace the real checks with counters and point the cache at a temp file"""
+    monkeypatch.setattr(doctor, "CACHE_PATH", str(tmp_path / "doctor_cache.json"))
+    monkeypatch.setenv("GROQ_API_KEY", "key-1")
+    calls = {"Groq": 0, "Jira": 0}
+    outcome = {"Groq": "API key accepted"}
+
+    def check_groq(timeout):
+        calls["Groq"] += 1
+        if outcome["Groq"] is None:
+            raise RuntimeError("rejected")
+        return outcome["Groq"]
+
+    def check_jira(timeout):
+        calls["Jira"] += 1
+        return "authenticated as Tester"
+
+    monkeypatch.setattr(doctor, "CHECKS", {
+        "Groq": (check_groq, ("GROQ_API_KEY",)),
+        "Jira": (check_jira, ("JIRA_API_TOKEN",)),
+    })
+    return calls, outcome
+
+def test_passing_results_are_cached_within_ttl(checks):
+    calls, _ = checks
+    first = doctor.run_preflight(ttl=600)
+    second = doctor.run_preflight(ttl=600)
+    assert first["Groq"]["status"] == "ok" and not first["Groq"]["cached"]
+    assert second["Groq"]["cached"] and second["Jira"]["cached"]
+    assert calls == {"Groq": 1, "Jira": 1}
+
+def test_expired_results_are_checked_again(checks):
+    calls, _ = checks
+    doctor.run_preflight(ttl=600)
+    results = doctor.run_preflight(ttl=0)
+    assert not results["Groq"]["cached"]
+    assert calls == {"Groq": 2, "Jira": 2}
+
+def test_changed_credentials_invalidate_the_cache(checks, monkeypatch):
+    calls, _ = checks
+    doctor.run_preflight(ttl=600)
+    monkeypatch.setenv("GROQ_API_KEY", "key-2")
+    results = doctor.run_preflight(ttl=600)
+    assert not results["Groq"]["cached"] and results["Jira"]["cached"]
+    assert calls == {"Groq": 2, "Jira": 1}
+
+def test_failures_are_never_cached(checks):
+    calls, outcome = checks
+    outcome["Groq"] = None
+    assert doctor.run_preflight(ttl=600)["Groq"]["status"] == "failed"
+    outcome["Groq"] = "API key accepted"
+    results = doctor.run_preflight(ttl=600)
+    assert results["Groq"]["status"] == "ok" and not results["Groq"]["cached"]
+    assert calls["Groq"] == 2
+
+def test_cache_does_not_store_credentials(checks):
+    doctor.run_preflight(ttl=600)
+    with open(doctor.CACHE_PATH, encoding="utf-8") as f:
+        assert "key-1" not in f.read()
+
+def test_openai_is_not_required():
+    assert "OpenAI" not in doctor.REQUIRED_SERVICES
@@ -0,0 +1,74 @@
+import time
+
+from job_queue import JobQueue
+
+def make_queue(tmp_path, **kwargs):
+    return JobQueue(str(tmp_path / "queue.db"), **kwargs)
+
+def test_enqueue_ignores_duplicate_tickets(tmp_path):
+    queue = make_queue(tmp_path)
+    assert queue.enqueue("KAN-1", "Weather app", "Show the weather")
+    assert not queue.enqueue("KAN-1", "Weather app", "Show the weather")
+    assert queue.stats() == {"pending": 1}
+
+def test_claim_is_exclusive(tmp_path):
+    queue = make_queue(tmp_path)
+    queue.enqueue("KAN-1", "Weather app", "Show the weather")
+    job = queue.claim("worker-1")
+    assert job["ticket_key"] == "KAN-1"
+    assert job["attempts"] == 1
+    assert queue.claim("worker-2") is None
+
+def test_expired_lease_is_taken_over(tmp_path):
+    queue = make_queue(tmp_path, lease_seconds=0.2)
+    queue.enqueue("KAN-1", "Weather app", "Show the weather")
+    job = queue.claim("worker-1")
+    time.sleep(0.3)
+    takeover = queue.claim("worker-2")
+    assert takeover["id"] == job["id"]
+    assert takeover["attempts"] == 2
+    assert not queue.heartbeat(job["id"], "worker-1")
+    assert queue.heartbeat(job["id"], "worker-2")
+
+def test_complete_is_rejected_after_takeover(tmp_path):
+    queue = make_queue(tmp_path, lease_seconds=0.2)
+    queue.enqueue("KAN-1", "Weather app", "Show the weather")
+    job = queue.claim("worker-1")
+    time.sleep(0.3)
+    queue.claim("worker-2")
+    assert not queue.complete(job["id"], "worker-1")
+    assert queue.complete(job["id"], "worker-2")
+    assert queue.stats() == {"done": 1}
+
+def test_job_fails_after_max_attempts(tmp_path):
+    queue = make_queue(tmp_path, max_attempts=2)
+    queue.enqueue("KAN-1", "Weather app", "Show the weather")
+    job = queue.claim("worker-1")
+    assert queue.fail(job["id"], "worker-1", "boom")
+    assert queue.stats() == {"pending": 1}
+    job = queue.claim("worker-1")
+    assert queue.fail(job["id"], "worker-1", "boom")
+    assert queue.stats() == {"failed": 1}
+    assert queue.claim("worker-1") is None
+
+def test_enqueue_retries_failed_jobs(tmp_path):
+    queue = make_queue(tmp_path, max_attempts=1)
+    queue.enqueue("KAN-1", "Weather app", "Show the weather")
+    job = queue.claim("worker-1")
+    queue.fail(job["id"], "worker-1", "boom")
+    assert queue.stats() == {"failed": 1}
+    assert queue.enqueue("KAN-1", "Weather app", "Show the weather")
+    assert queue.claim("worker-1")["attempts"] == 1
+
+def test_requeue_resets_done_and_failed_jobs(tmp_path):
+    queue = make_queue(tmp_path, max_attempts=1)
+    for key in ("KAN-1", "KAN-2", "KAN-3"):
+        queue.enqueue(key, "Weather app", "Show the weather")
+    job = queue.claim("worker-1")
+    queue.complete(job["id"], "worker-1")
+    job = queue.claim("worker-1")
+    queue.fail(job["id"], "worker-1", "boom")
+    queue.claim("worker-1")
+    assert not queue.enqueue("KAN-1", "Weather app", "Show the weather")
+    assert queue.requeue(["KAN-1", "KAN-2", "KAN-3"]) == 2
+    assert queue.stats() == {"pending": 2, "leased": 1}
@@ -0,0 +1,61 @@
+import os
+
+from similarity_index import TicketIndex, DEFAULT_SIMILARITY_THRESHOLD, MAX_BASE_FILE_CHARS, merge_base_files
+
+WEATHER = ("KAN-1", "Weather dashboard", "Display the current weather at the user's location using OpenWeather")
+STOCKS = ("KAN-2", "Stock price viewer", "Display stock prices for a list of symbols")
+
+def make_index(tmp_path, *tickets):
+    index = TicketIndex(str(tmp_path))
+    for ticket_key, summary, description in tickets:
+        project_name = f"project_{ticket_key.lower()}"
+        os.makedirs(tmp_path / project_name, exist_ok=True)
+        index.add(ticket_key, summary, description, project_name)
+    return index
+
+def test_nearest_matches_reworded_ticket(tmp_path):
+    index = make_index(tmp_path, WEATHER, STOCKS)
+    match, score = index.nearest("Weather forecast page", "Display a 5 day forecast at the user's location using OpenWeather")
+    assert match["ticket_key"] == "KAN-1"
+    assert score >= DEFAULT_SIMILARITY_THRESHOLD
+
+def test_nearest_rejects_unrelated_ticket(tmp_path):
+    index = make_index(tmp_path, WEATHER, STOCKS)
+    _, score = index.nearest("Recipe finder", "Search recipes by ingredient using the Spoonacular API")
+    assert score < DEFAULT_SIMILARITY_THRESHOLD
+
+def test_nearest_respects_exclude_project(tmp_path):
+    index = make_index(tmp_path, WEATHER, STOCKS)
+    match, _ = index.nearest(*WEATHER[1:], exclude_project="project_kan-1")
+    assert match is None or match["ticket_key"] != "KAN-1"
+
+def test_nearest_skips_missing_projects(tmp_path):
+    index = make_index(tmp_path, WEATHER)
+    os.rmdir(tmp_path / "project_kan-1")
+    assert index.nearest(*WEATHER[1:]) == (None, 0.0)
+
+def test_nearest_returns_none_for_empty_query(tmp_path):
+    index = make_index(tmp_path, WEATHER)
+    assert index.nearest("", "") == (None, 0.0)
+    assert index.nearest("the app", "for the user") == (None, 0.0)
+
+def test_load_project_files_reports_oversize_files(tmp_path):
+    index = make_index(tmp_path, WEATHER)
+    project_path = tmp_path / "project_kan-1"
+    (project_path / "src").mkdir()
+    (project_path / "src" / "main.py").write_text("print('hi')\n")
+    (project_path / "src" / "data.js").write_text("x" * (MAX_BASE_FILE_CHARS + 1))
+    (project_path / "venv").mkdir()
+    (project_path / "venv" / "ignored.py").write_text("")
+    files, omitted = index.load_project_files("project_kan-1")
+    assert files == [{"path": "src/main.py", "content": "print('hi')\n"}]
+    assert omitted == ["src/data.js"]
+
+def test_merge_base_files_overlays_changed_files():
+    base_files = [{"path": "src/main.py", "content": "old"}, {"path": "src/style.css", "content": "css"}]
+    changed_files = [{"path": "src/main.py", "content": "new"}, {"path": "src/forecast.py", "content": "added"}]
+    assert merge_base_files(base_files, changed_files) == [
+        {"path": "src/main.py", "content": "new"},
+        {"path": "src/style.css", "content": "css"},
+        {"path": "src/forecast.py", "content": "added"},
+    ]
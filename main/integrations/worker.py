@@ -0,0 +1,198 @@
+import argparse
+import multiprocessing
+import os
+import shutil
+import socket
+import threading
+import time
+import uuid
+
+from job_queue import JobQueue, DEFAULT_LEASE_SECONDS, DEFAULT_MAX_ATTEMPTS
+from similarity_index import TicketIndex
+from doctor import run_preflight, print_report, preflight_ok
+
+POLL_INTERVAL_SECONDS = 5
+# A job still running after this long stops renewing its lease, so a hung worker cannot hold it forever
+DEFAULT_MAX_JOB_SECONDS = 1800
+
+def make_worker_id():
+    """Build a worker id that is unique across the worker processes on this host"""
+    return f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+
+class LeaseLostError(RuntimeError):
+    """Raised when another worker has taken over the job being processed"""
+
+def heartbeat_loop(queue, job_id, worker_id, stop_event, lease_lost, max_job_seconds):
+    """Renew the lease on a job until the worker signals it is finished or the job runs too long"""
+    interval = max(1, queue.lease_seconds / 3)
+    deadline = time.time() + max_job_seconds
+    while not stop_event.wait(interval):
+        if time.time() > deadline:
+            print(f"⚠️ [{worker_id}] Job {job_id} exceeded {max_job_seconds}s, releasing its lease to other workers")
+            lease_lost.set()
+            return
+        if not queue.heartbeat(job_id, worker_id):
+            print(f"⚠️ [{worker_id}] Lost lease on job {job_id}")
+            lease_lost.set()
+            return
+
+def ensure_lease(queue, job, worker_id, lease_lost):
+    """Stop before touching the project directory if another worker now owns the job"""
+    if lease_lost.is_set() or not queue.heartbeat(job["id"], worker_id):
+        lease_lost.set()
+        raise LeaseLostError(f"lease on {job['ticket_key']} was taken over")
+
+def process_job(generator, jira, queue, job, worker_id, lease_lost, setup_venv, regenerate):
+    """Generate the project for a single ticket job; returns None if it was skipped"""
+    project_exists, project_name = generator.check_existing_project(job["ticket_key"])
+    if project_exists and not regenerate:
+        print(f"⏭️ [{worker_id}] {project_name} already exists, skipping (use --regenerate to overwrite)")
+        return None
+    generator.transition_to_in_progress(jira, job["ticket_key"])
+
+    project_data = generator.generate_application_code(job["description"], job["summary"], job["ticket_key"])
+    if not project_data:
+        raise RuntimeError("failed to generate application code")
+    ensure_lease(queue, job, worker_id, lease_lost)
+    if project_exists:
+        # Start from an empty directory so files from the previous generation do not linger
+        shutil.rmtree(os.path.join(generator.get_project_base_path(), project_name))
+    if not generator.create_application_files(project_data):
+        raise RuntimeError("failed to create application files")
+    ensure_lease(queue, job, worker_id, lease_lost)
+    TicketIndex(generator.get_project_base_path()).add(
+        job["ticket_key"], job["summary"], job["description"], project_data["project_name"]
+    )
+    if setup_venv:
+        success, _ = generator.setup_virtual_environment(project_data["project_name"])
+        if not success:
+            raise RuntimeError("failed to set up virtual environment")
+    return project_data["project_name"]
+
+def run_worker(queue_path, artifact_root, lease_seconds, max_attempts, setup_venv, drain, regenerate, max_job_seconds):
+    """Pull jobs from the shared queue until it is empty (drain) or forever"""
+    if artifact_root:
+        os.environ["ARTIFACT_ROOT"] = artifact_root
+    queue = JobQueue(queue_path, lease_seconds=lease_seconds, max_attempts=max_attempts)
+    worker_id = make_worker_id()
+    try:
+        # Imported before claiming anything: main exits on missing credentials,
+        # which must not happen while this worker holds a lease
+        import main as generator
+        jira = generator.connect_jira()
+    except SystemExit:
+        print(f"❌ [{worker_id}] Could not load the generator, stopping.")
+        return
+    print(f"👷 Worker {worker_id} started")
+
+    while True:
+        job = queue.claim(worker_id)
+        if job is None:
+            if drain:
+                print(f"📭 [{worker_id}] Queue is empty, stopping.")
+                return
+            time.sleep(POLL_INTERVAL_SECONDS)
+            continue
+
+        print(f"\n🔧 [{worker_id}] Processing {job['ticket_key']} (attempt {job['attempts']})")
+        stop_event = threading.Event()
+        lease_lost = threading.Event()
+        heartbeat = threading.Thread(
+            target=heartbeat_loop,
+            args=(queue, job["id"], worker_id, stop_event, lease_lost, max_job_seconds),
+            daemon=True
+        )
+        heartbeat.start()
+        try:
+            project_name = process_job(generator, jira, queue, job, worker_id, lease_lost, setup_venv, regenerate)
+        except BaseException as e:
+            stop_event.set()
+            heartbeat.join()
+            # Release the job even on SystemExit/KeyboardInterrupt so it is not stuck until the lease expires
+            queue.fail(job["id"], worker_id, e)
+            print(f"❌ [{worker_id}] {job['ticket_key']} failed: {e!r}")
+            if not isinstance(e, Exception):
+                raise
+            continue
+        stop_event.set()
+        heartbeat.join()
+        if not queue.complete(job["id"], worker_id):
+            print(f"⚠️ [{worker_id}] {job['ticket_key']} finished after its lease was taken over")
+        elif project_name:
+            print(f"✅ [{worker_id}] {job['ticket_key']} done: {project_name}")
+
+def enqueue_tickets(queue, max_results):
+    """Fetch assigned tickets that are NOT in Done and add them to the queue"""
+    import main
+
+    jira = main.connect_jira()
+    jql_query = 'assignee = currentUser() AND statusCategory != Done ORDER BY updated DESC'
+    issues = jira.search_issues(jql_query, maxResults=max_results)
+    added = 0
+    for issue in issues:
+        if queue.enqueue(issue.key, issue.fields.summary, issue.fields.description or ""):
+            added += 1
+            print(f"  └─ Queued: {issue.key} - {issue.fields.summary}")
+    print(f"\n📥 Queued {added} new or failed ticket(s), {len(issues) - added} already queued or done.")
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Run ticket generation jobs from a shared queue")
+    parser.add_argument("--queue", help="Path to the SQLite job queue on a local disk (default: JOB_QUEUE_PATH or job_queue.db)")
+    parser.add_argument("--lease-seconds", type=int, default=DEFAULT_LEASE_SECONDS)
+    parser.add_argument("--max-attempts", type=int, default=DEFAULT_MAX_ATTEMPTS)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    enqueue_parser = subparsers.add_parser("enqueue", help="Queue assigned Jira tickets")
+    enqueue_parser.add_argument("--max-results", type=int, default=50)
+
+    work_parser = subparsers.add_parser("work", help="Start worker processes")
+    work_parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    work_parser.add_argument("--artifact-root", help="Directory for generated projects (default: ARTIFACT_ROOT)")
+    work_parser.add_argument("--no-venv", action="store_true", help="Skip creating a virtual environment per project")
+    work_parser.add_argument("--drain", action="store_true", help="Exit once the queue is empty")
+    work_parser.add_argument("--regenerate", action="store_true", help="Overwrite projects that already exist")
+    work_parser.add_argument("--max-job-seconds", type=int, default=DEFAULT_MAX_JOB_SECONDS,
+                             help="Stop renewing the lease of a job that runs longer than this")
+
+    requeue_parser = subparsers.add_parser("requeue", help="Queue done or failed tickets again")
+    requeue_parser.add_argument("ticket_keys", nargs="+", metavar="TICKET")
+
+    subparsers.add_parser("status", help="Show job counts by status")
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    queue = JobQueue(args.queue, lease_seconds=args.lease_seconds, max_attempts=args.max_attempts)
+
+    if args.command == "enqueue":
+        enqueue_tickets(queue, args.max_results)
+    elif args.command == "requeue":
+        count = queue.requeue(args.ticket_keys)
+        print(f"\n🔁 Requeued {count} of {len(args.ticket_keys)} ticket(s).")
+    elif args.command == "status":
+        stats = queue.stats()
+        print("\n📊 Job queue status:")
+        for status in ("pending", "leased", "done", "failed"):
+            print(f"  └─ {status}: {stats.get(status, 0)}")
+    elif args.command == "work":
+        # Catch bad credentials before any job is leased
+        results = run_preflight()
+        print_report(results)
+        if not preflight_ok(results):
+            print("❌ Preflight checks failed. Run integrations/doctor.py for details.")
+            return
+        worker_args = (
+            queue.path, args.artifact_root, args.lease_seconds, args.max_attempts,
+            not args.no_venv, args.drain, args.regenerate, args.max_job_seconds
+        )
+        if args.workers <= 1:
+            run_worker(*worker_args)
+            return
+        processes = [multiprocessing.Process(target=run_worker, args=worker_args) for _ in range(args.workers)]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+
+if __name__ == "__main__":
+    main()